@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.core'
+    verbose_name = _('Core')
+
+    def ready(self):
+        from . import audit
+        from . import config  # noqa: F401 (connects SystemConfig cache invalidation)
+
+        # Start the background writer used by audit.log_audit()
+        audit.start()
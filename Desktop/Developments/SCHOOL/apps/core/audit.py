@@ -0,0 +1,205 @@
+# apps/core/audit.py
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+
+from django.db import IntegrityError, close_old_connections, connection, transaction
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of entries written per INSERT batch
+BATCH_SIZE = 1000
+# Maximum time (seconds) an entry waits in the queue before being flushed
+FLUSH_INTERVAL = 0.5
+
+_queue = queue.SimpleQueue()
+_stop = threading.Event()
+_worker = None
+_worker_lock = threading.Lock()
+
+# Process-local LRU of user-agent string -> UserAgent id
+USER_AGENT_CACHE_SIZE = 1024
+_user_agent_ids = OrderedDict()
+_user_agent_lock = threading.Lock()
+
+
+def log_audit(**kwargs):
+    """
+    Queue an audit event for background insertion.
+
+    Accepts the same keyword arguments as AuditLog and returns the unsaved
+    instance. user_agent may be given as a plain string; the worker thread
+    resolves it to a UserAgent row outside any request transaction. The entry
+    is queued only once the current transaction commits, so events from
+    rolled-back requests are never written. Rows are written in batches by the
+    worker thread, so the entry is not visible in the database until the next
+    flush.
+    """
+    from .models import AuditLog
+
+    user_agent = kwargs.pop('user_agent') if isinstance(kwargs.get('user_agent'), str) else None
+    entry = AuditLog(**kwargs)
+    if user_agent:
+        entry._user_agent_value = user_agent
+    transaction.on_commit(partial(_enqueue, entry))
+    return entry
+
+
+def _enqueue(entry):
+    start()
+    _queue.put(entry)
+
+
+def intern_user_agent(value):
+    """
+    Return the UserAgent primary key for value, creating the row if needed.
+
+    Ids are cached only once the row is committed, so a rolled-back
+    transaction cannot leave a dangling id in the cache.
+    """
+    from .models import UserAgent
+
+    with _user_agent_lock:
+        user_agent_id = _user_agent_ids.get(value)
+        if user_agent_id is not None:
+            _user_agent_ids.move_to_end(value)
+            return user_agent_id
+    user_agent, _ = UserAgent.objects.get_or_create(
+        value_hash=UserAgent.hash_value(value), defaults={'value': value}
+    )
+    transaction.on_commit(partial(_cache_user_agent, value, user_agent.pk))
+    return user_agent.pk
+
+
+def _cache_user_agent(value, user_agent_id):
+    with _user_agent_lock:
+        _user_agent_ids[value] = user_agent_id
+        _user_agent_ids.move_to_end(value)
+        if len(_user_agent_ids) > USER_AGENT_CACHE_SIZE:
+            _user_agent_ids.popitem(last=False)
+
+
+def start():
+    """
+    Start the background writer thread if it is not already running.
+    """
+    global _worker
+    if _worker is not None and _worker.is_alive():
+        return
+    with _worker_lock:
+        if _worker is not None and _worker.is_alive():
+            return
+        _stop.clear()
+        _worker = threading.Thread(target=_run, name='audit-log-writer', daemon=True)
+        _worker.start()
+
+
+def flush():
+    """
+    Synchronously write every queued entry.
+    """
+    while True:
+        batch = _drain(BATCH_SIZE)
+        if not batch:
+            return
+        _write(batch)
+
+
+def shutdown(timeout=5):
+    """
+    Stop the writer thread and flush whatever is still queued.
+    """
+    _stop.set()
+    if _worker is not None:
+        _worker.join(timeout)
+    flush()
+
+
+def _drain(max_items):
+    batch = []
+    while len(batch) < max_items:
+        try:
+            batch.append(_queue.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+
+def _collect():
+    """
+    Block until an entry arrives, then gather up to BATCH_SIZE entries or
+    until FLUSH_INTERVAL has passed since the first one.
+    """
+    batch = []
+    deadline = None
+    while len(batch) < BATCH_SIZE:
+        timeout = FLUSH_INTERVAL if deadline is None else deadline - time.monotonic()
+        if timeout <= 0:
+            break
+        try:
+            batch.append(_queue.get(timeout=timeout))
+        except queue.Empty:
+            break
+        if deadline is None:
+            deadline = time.monotonic() + FLUSH_INTERVAL
+    return batch
+
+
+def _write(batch):
+    try:
+        _resolve_user_agents(batch)
+    except Exception:
+        logger.exception('Failed to resolve user agents for %d audit log entries', len(batch))
+    _write_or_split(batch)
+
+
+def _resolve_user_agents(batch):
+    for entry in batch:
+        value = entry.__dict__.pop('_user_agent_value', None)
+        if value:
+            entry.user_agent_id = intern_user_agent(value)
+
+
+def _write_or_split(batch):
+    """
+    Insert batch, splitting it on integrity errors so one bad entry does not
+    drop the events around it.
+    """
+    try:
+        _insert(batch)
+    except IntegrityError:
+        if len(batch) == 1:
+            logger.exception('Dropping audit log entry that violates a constraint')
+            return
+        middle = len(batch) // 2
+        _write_or_split(batch[:middle])
+        _write_or_split(batch[middle:])
+    except Exception:
+        logger.exception('Failed to write %d audit log entries', len(batch))
+
+
+def _insert(batch):
+    from .models import AuditLog
+
+    with transaction.atomic():
+        AuditLog.objects.bulk_create(batch, batch_size=BATCH_SIZE, ignore_conflicts=True)
+        # Foreign keys are deferred on PostgreSQL; check them before leaving
+        # the block so a violation fails this batch rather than the commit
+        connection.check_constraints()
+
+
+def _run():
+    while not _stop.is_set():
+        batch = _collect()
+        if batch:
+            close_old_connections()
+            _write(batch)
+    flush()
+
+
+atexit.register(shutdown)
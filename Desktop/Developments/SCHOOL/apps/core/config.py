@@ -0,0 +1,78 @@
+# apps/core/config.py
+
+import time
+import uuid
+from functools import lru_cache
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import SystemConfig
+
+# Shared token that changes whenever any SystemConfig is written, so every
+# process sharing the Django cache drops its local copies
+VERSION_CACHE_KEY = 'core:system_config:version'
+# Seconds between checks of the shared token; other processes see a change
+# at most this late, while this process sees its own writes at once
+VERSION_CHECK_INTERVAL = 1.0
+
+_MISSING = object()
+_local_version = _MISSING
+_version_checked_at = None
+
+
+def get_config(key, default=None):
+    """
+    Return the value of the SystemConfig with the given key, or default.
+
+    Values are cached in process memory until any SystemConfig is saved or
+    deleted; writes from other processes are noticed within
+    VERSION_CHECK_INTERVAL seconds. The returned value is shared between callers and must not be
+    mutated.
+    """
+    global _local_version, _version_checked_at
+    now = time.monotonic()
+    if _version_checked_at is None or now - _version_checked_at >= VERSION_CHECK_INTERVAL:
+        version = cache.get(VERSION_CACHE_KEY)
+        if version != _local_version:
+            _load_config.cache_clear()
+            _local_version = version
+        _version_checked_at = now
+    value = _load_config(key)
+    return default if value is _MISSING else value
+
+
+def invalidate_config_cache():
+    """
+    Drop cached configuration values in this and every other process.
+    """
+    global _local_version
+    version = uuid.uuid4().hex
+    cache.set(VERSION_CACHE_KEY, version, timeout=None)
+    _load_config.cache_clear()
+    # This process is already current; skip a second clear on the next check
+    _local_version = version
+
+
+def invalidate_config_cache_on_commit(using=None):
+    """
+    Invalidate once the current transaction commits. Invalidating earlier lets
+    a concurrent reader cache the old value under the new version token.
+    """
+    transaction.on_commit(invalidate_config_cache, using=using)
+
+
+@lru_cache(maxsize=256)
+def _load_config(key):
+    try:
+        return SystemConfig.objects.values_list('value', flat=True).get(key=key)
+    except SystemConfig.DoesNotExist:
+        return _MISSING
+
+
+@receiver(post_save, sender=SystemConfig, dispatch_uid='core_system_config_saved')
+@receiver(post_delete, sender=SystemConfig, dispatch_uid='core_system_config_deleted')
+def _system_config_changed(sender, using=None, **kwargs):
+    invalidate_config_cache_on_commit(using=using)
@@ -0,0 +1,76 @@
+# Generated by Django 4.2.30 on 2026-10-14 17:33
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("core", "0002_add_user_fields"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="auditlog",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["timestamp"],
+                name="core_auditlog_live_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="fileattachment",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["created_at"],
+                name="core_fileattachment_live_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["created_at"],
+                name="core_notification_live_idx",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="academicsession",
+            name="is_deleted",
+            field=models.BooleanField(default=False, verbose_name="is deleted"),
+        ),
+        migrations.AlterField(
+            model_name="auditlog",
+            name="is_deleted",
+            field=models.BooleanField(default=False, verbose_name="is deleted"),
+        ),
+        migrations.AlterField(
+            model_name="fileattachment",
+            name="is_deleted",
+            field=models.BooleanField(default=False, verbose_name="is deleted"),
+        ),
+        migrations.AlterField(
+            model_name="holiday",
+            name="is_deleted",
+            field=models.BooleanField(default=False, verbose_name="is deleted"),
+        ),
+        migrations.AlterField(
+            model_name="notification",
+            name="is_deleted",
+            field=models.BooleanField(default=False, verbose_name="is deleted"),
+        ),
+        migrations.AlterField(
+            model_name="sequencegenerator",
+            name="is_deleted",
+            field=models.BooleanField(default=False, verbose_name="is deleted"),
+        ),
+        migrations.AlterField(
+            model_name="systemconfig",
+            name="is_deleted",
+            field=models.BooleanField(default=False, verbose_name="is deleted"),
+        ),
+    ]
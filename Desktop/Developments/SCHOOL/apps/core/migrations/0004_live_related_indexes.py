@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-14 17:35
+
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    RemoveIndexConcurrently,
+)
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("core", "0003_soft_delete_live_indexes"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="fileattachment",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["related_model", "related_object_id"],
+                name="core_fileattach_live_rel_idx",
+            ),
+        ),
+        RemoveIndexConcurrently(
+            model_name="fileattachment",
+            name="core_fileat_related_2fec8c_idx",
+        ),
+        AddIndexConcurrently(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("is_deleted", False)),
+                fields=["related_model", "related_object_id"],
+                name="core_notification_live_rel_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-14 17:41
+
+from django.contrib.postgres.operations import (
+    AddIndexConcurrently,
+    RemoveIndexConcurrently,
+)
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("core", "0005_drop_updated_at_index"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="auditlog",
+            index=models.Index(
+                fields=["object_id", "model_name", "timestamp"],
+                name="core_auditlog_object_idx",
+            ),
+        ),
+        RemoveIndexConcurrently(
+            model_name="auditlog",
+            name="core_auditl_model_n_3fb686_idx",
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-14 17:38
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("core", "0006_auditlog_object_index"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="auditlog",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["details"],
+                name="core_auditlog_details_gin",
+                opclasses=["jsonb_path_ops"],
+            ),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 4.2.30 on 2026-10-14 17:39
+
+import apps.core.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_auditlog_details_gin"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="academicsession",
+            name="id",
+            field=models.UUIDField(
+                default=apps.core.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="auditlog",
+            name="id",
+            field=models.UUIDField(
+                default=apps.core.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="fileattachment",
+            name="id",
+            field=models.UUIDField(
+                default=apps.core.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="holiday",
+            name="id",
+            field=models.UUIDField(
+                default=apps.core.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="notification",
+            name="id",
+            field=models.UUIDField(
+                default=apps.core.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="sequencegenerator",
+            name="id",
+            field=models.UUIDField(
+                default=apps.core.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="systemconfig",
+            name="id",
+            field=models.UUIDField(
+                default=apps.core.models.uuid7,
+                editable=False,
+                primary_key=True,
+                serialize=False,
+            ),
+        ),
+    ]
@@ -0,0 +1,102 @@
+# Generated by Django 4.2.30 on 2026-10-14 17:40
+
+import hashlib
+from itertools import islice
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+BATCH_SIZE = 1000
+
+
+def _hash_value(value):
+    # Mirrors UserAgent.hash_value(); historical models have no methods
+    digest = hashlib.blake2b(value.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") & 0x7FFF_FFFF_FFFF_FFFF
+
+
+def intern_user_agents(apps, schema_editor):
+    AuditLog = apps.get_model("core", "AuditLog")
+    UserAgent = apps.get_model("core", "UserAgent")
+    # order_by() drops Meta.ordering, which would otherwise add timestamp to
+    # the SELECT DISTINCT and return one row per audit entry
+    values = (
+        AuditLog.objects.exclude(user_agent_text="")
+        .order_by()
+        .values_list("user_agent_text", flat=True)
+        .distinct()
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    while batch := list(islice(values, BATCH_SIZE)):
+        UserAgent.objects.bulk_create(
+            [UserAgent(value_hash=_hash_value(value), value=value) for value in batch],
+            ignore_conflicts=True,
+        )
+    # Link every audit row in one set-based UPDATE rather than one scan per value
+    schema_editor.execute(
+        'UPDATE "core_auditlog" AS a SET "user_agent_id" = u."id" '
+        'FROM "core_useragent" AS u WHERE u."value" = a."user_agent_text"'
+    )
+
+
+def restore_user_agents(apps, schema_editor):
+    schema_editor.execute(
+        'UPDATE "core_auditlog" AS a SET "user_agent_text" = u."value" '
+        'FROM "core_useragent" AS u WHERE u."id" = a."user_agent_id"'
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_uuid7_primary_keys"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserAgent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "value_hash",
+                    models.BigIntegerField(unique=True, verbose_name="value hash"),
+                ),
+                ("value", models.TextField(verbose_name="user agent")),
+            ],
+            options={
+                "verbose_name": "User Agent",
+                "verbose_name_plural": "User Agents",
+            },
+        ),
+        migrations.RenameField(
+            model_name="auditlog",
+            old_name="user_agent",
+            new_name="user_agent_text",
+        ),
+        migrations.AddField(
+            model_name="auditlog",
+            name="user_agent",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="+",
+                to="core.useragent",
+                verbose_name="user agent",
+            ),
+        ),
+        migrations.RunPython(intern_user_agents, restore_user_agents),
+        migrations.RemoveField(
+            model_name="auditlog",
+            name="user_agent_text",
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-14 17:42
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("core", "0009_intern_user_agents"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="auditlog",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["timestamp"], name="core_auditlog_ts_brin", pages_per_range=32
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-14 17:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_auditlog_timestamp_brin"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="sequencegenerator",
+            name="padding",
+            field=models.PositiveIntegerField(default=6, verbose_name="number padding"),
+        ),
+        migrations.AddConstraint(
+            model_name="sequencegenerator",
+            constraint=models.CheckConstraint(
+                check=models.Q(("padding__gte", 1), ("padding__lte", 10)),
+                name="sequence_padding_range",
+            ),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-14 17:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0012_sequence_padding_check"),
+    ]
+
+    operations = [
+        # Keep only the latest-starting current session so the constraint can
+        # be created on data written before it existed
+        migrations.RunSQL(
+            sql=(
+                'UPDATE "core_academicsession" SET "is_current" = false '
+                'WHERE "is_current" AND "id" <> ('
+                'SELECT "id" FROM "core_academicsession" WHERE "is_current" '
+                'ORDER BY "start_date" DESC LIMIT 1)'
+            ),
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddConstraint(
+            model_name="academicsession",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_current", True)),
+                fields=("is_current",),
+                name="single_current_session",
+            ),
+        ),
+    ]
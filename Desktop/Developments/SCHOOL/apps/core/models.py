@@ -1,30 +1,55 @@
 # apps/core/models.py
 
+import hashlib
+import os
+import time
 import uuid
-from django.db import models
+from itertools import islice
+from django.db import models, router, transaction
+from django.db.models.functions import Cast, Concat, NullIf, Round
 from django.utils import timezone
-from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
 
 # The Core app models
 
+# Marker for "value not loaded from the database"
+_UNSET = object()
+
+# Rows per INSERT when broadcasting notifications
+NOTIFICATION_BATCH_SIZE = 5000
+
 class TimeStampedModel(models.Model):
     """
     Abstract base model that provides self-updating created and modified fields.
     """
     created_at = models.DateTimeField(_('created at'), auto_now_add=True, db_index=True)
-    updated_at = models.DateTimeField(_('updated at'), auto_now=True, db_index=True)
+    updated_at = models.DateTimeField(_('updated at'), auto_now=True)
 
     class Meta:
         abstract = True
 
 
+def uuid7():
+    """
+    Return a time-ordered version 7 UUID (RFC 9562).
+
+    The leading 48 bits are the Unix time in milliseconds, so new primary keys
+    are appended to the end of the index instead of landing on random pages.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # variant
+    return uuid.UUID(int=value)
+
+
 class UUIDModel(models.Model):
     """
     Abstract base model that provides a UUID primary key instead of auto-increment.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
 
     class Meta:
         abstract = True
@@ -53,24 +78,54 @@ class StatusModel(models.Model):
     class Meta:
         abstract = True
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Remember the status loaded from the database so save() can detect changes.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('status', _UNSET)
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        if fields is None or 'status' in fields:
+            self._loaded_status = self.status
+
     def save(self, *args, **kwargs):
         """
         Update status_changed_at when status changes.
         """
         if self.pk and not self._state.adding:  # Check if object exists and is not being added
-            original = self.__class__.objects.get(pk=self.pk)
-            if original.status != self.status:
+            loaded_status = getattr(self, '_loaded_status', _UNSET)
+            if loaded_status is _UNSET:
+                # Status was deferred or never loaded; fetch only that column
+                loaded_status = self.__class__._base_manager.only('status').get(pk=self.pk).status
+            if loaded_status != self.status:
                 self.status_changed_at = timezone.now()
         super().save(*args, **kwargs)
+        self._loaded_status = self.status
+
+
+class SoftDeleteManager(models.Manager):
+    """
+    Manager that hides soft-deleted rows, so default querysets can use the
+    partial live-row indexes.
+    """
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
 
 
 class SoftDeleteModel(models.Model):
     """
     Abstract base model that provides soft delete functionality.
     """
-    is_deleted = models.BooleanField(_('is deleted'), default=False, db_index=True)
+    is_deleted = models.BooleanField(_('is deleted'), default=False)
     deleted_at = models.DateTimeField(_('deleted at'), null=True, blank=True)
 
+    objects = SoftDeleteManager()
+    all_objects = models.Manager()
+
     class Meta:
         abstract = True
 
@@ -78,9 +133,7 @@ class SoftDeleteModel(models.Model):
         """
         Soft delete by setting is_deleted flag and deleted_at timestamp.
         """
-        self.is_deleted = True
-        self.deleted_at = timezone.now()
-        self.save()
+        self._update_row(using, is_deleted=True, deleted_at=timezone.now())
 
     def hard_delete(self, using=None, keep_parents=False):
         """
@@ -92,9 +145,19 @@ class SoftDeleteModel(models.Model):
         """
         Restore a soft-deleted instance.
         """
-        self.is_deleted = False
-        self.deleted_at = None
-        self.save()
+        self._update_row(None, is_deleted=False, deleted_at=None)
+
+    def _update_row(self, using, **values):
+        """
+        Write values with a single UPDATE and mirror them on this instance,
+        bumping updated_at as save() would when the model has it.
+        """
+        if any(field.name == 'updated_at' for field in self._meta.concrete_fields):
+            values['updated_at'] = timezone.now()
+        using = using or router.db_for_write(type(self), instance=self)
+        type(self)._base_manager.using(using).filter(pk=self.pk).update(**values)
+        for name, value in values.items():
+            setattr(self, name, value)
 
 
 class CoreBaseModel(TimeStampedModel, UUIDModel, StatusModel, SoftDeleteModel):
@@ -120,22 +183,43 @@ class AddressModel(models.Model):
     postal_code = models.CharField(_('postal code'), max_length=20, blank=True)
     country = models.CharField(_('country'), max_length=100, blank=True)
 
+    ADDRESS_FIELDS = ('address_line_1', 'address_line_2', 'city', 'state', 'postal_code', 'country')
+
     class Meta:
         abstract = True
 
     @property
     def full_address(self):
         """Return formatted full address."""
-        parts = [
-            self.address_line_1,
-            self.address_line_2,
-            self.city,
-            self.state,
-            self.postal_code,
-            self.country
-        ]
+        annotated = self.__dict__.get('_full_address')
+        if annotated is not None and annotated[1] == self._loaded_address_parts():
+            return annotated[0]
+        parts = [getattr(self, field) for field in self.ADDRESS_FIELDS]
         return ', '.join(filter(None, parts))
 
+    @full_address.setter
+    def full_address(self, value):
+        # Populated by annotate(full_address=...) on list queries. The parts it
+        # was built from are kept so later edits are not masked by it.
+        self._full_address = (value, self._loaded_address_parts())
+
+    def _loaded_address_parts(self):
+        # Read __dict__ directly so deferred fields are not fetched
+        return tuple(self.__dict__.get(field, _UNSET) for field in self.ADDRESS_FIELDS)
+
+    @classmethod
+    def full_address_expression(cls):
+        """
+        Return a database expression matching full_address, so list views can
+        build it in SQL with annotate(full_address=Model.full_address_expression()).
+        """
+        return models.Func(
+            models.Value(', '),
+            *[NullIf(field, models.Value('')) for field in cls.ADDRESS_FIELDS],
+            function='CONCAT_WS',
+            output_field=models.CharField()
+        )
+
 
 class ContactModel(models.Model):
     """
@@ -151,6 +235,122 @@ class ContactModel(models.Model):
         abstract = True
 
 
+class UserJoinQuerySet(models.QuerySet):
+    """
+    QuerySet for models whose default manager joins the related user.
+    """
+    def without_user(self):
+        """Drop the default user join when only the model's own columns are needed."""
+        return self.select_related(None)
+
+
+class UserJoinManager(SoftDeleteManager.from_queryset(UserJoinQuerySet)):
+    """
+    Live-row manager that always select_related()s the user foreign key, since
+    __str__ and list views render it for every row.
+    """
+    # Set on the class, not in __init__: Django subclasses the default
+    # manager for reverse relations and instantiates it without arguments
+    user_field = 'user'
+
+    def get_queryset(self):
+        return super().get_queryset().select_related(self.user_field)
+
+
+class AuditLogQuerySet(UserJoinQuerySet):
+    def for_list(self):
+        """Load only the columns shown in audit log listings."""
+        return self.only('id', 'user', 'action', 'model_name', 'timestamp')
+
+
+AuditLogManager = UserJoinManager.from_queryset(AuditLogQuerySet)
+
+
+class NotificationQuerySet(UserJoinQuerySet):
+    def for_list(self):
+        """Load only the columns shown in notification listings."""
+        return self.only(
+            'id', 'user', 'title', 'notification_type', 'priority', 'is_read', 'action_url', 'created_at'
+        )
+
+    def bulk_notify(self, users, **fields):
+        """
+        Create the same notification for every user (instances or primary keys)
+        using batched INSERTs. Returns the number of notifications created.
+        """
+        user_ids = (getattr(user, 'pk', user) for user in users)
+        created = 0
+        # Route like bulk_create() does, so the transaction opens on the
+        # database the INSERTs go to
+        self._for_write = True
+        with transaction.atomic(using=self.db):
+            while batch := list(islice(user_ids, NOTIFICATION_BATCH_SIZE)):
+                self.bulk_create(
+                    [self.model(user_id=user_id, **fields) for user_id in batch],
+                    batch_size=NOTIFICATION_BATCH_SIZE
+                )
+                created += len(batch)
+        return created
+
+
+NotificationManager = UserJoinManager.from_queryset(NotificationQuerySet)
+
+
+FILE_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+
+class FileAttachmentQuerySet(UserJoinQuerySet):
+    def for_list(self):
+        """Load only the columns shown in attachment listings."""
+        return self.only('id', 'name', 'file', 'file_type', 'size', 'uploaded_by', 'created_at')
+
+    def with_human_size(self):
+        """
+        Annotate each row with size_human, formatted in SQL the same way as
+        FileAttachment.file_size_human (halves round up in both).
+        """
+        def scaled(unit):
+            size = Cast('size', models.DecimalField(max_digits=20, decimal_places=4))
+            value = Round(size / models.Value(1 << (10 * unit)), 1)
+            return Concat(Cast(value, models.CharField()), models.Value(f' {FILE_SIZE_UNITS[unit]}'))
+
+        last_unit = len(FILE_SIZE_UNITS) - 1
+        return self.annotate(size_human=models.Case(
+            models.When(size__lt=1024, then=Concat(Cast('size', models.CharField()), models.Value(' B'))),
+            *[
+                models.When(size__lt=1 << (10 * (unit + 1)), then=scaled(unit))
+                for unit in range(1, last_unit)
+            ],
+            default=scaled(last_unit),
+            output_field=models.CharField()
+        ))
+
+
+class FileAttachmentManager(UserJoinManager.from_queryset(FileAttachmentQuerySet)):
+    user_field = 'uploaded_by'
+
+
+class UserAgent(models.Model):
+    """
+    Interned user-agent strings, shared by all audit log entries that report them.
+    """
+    value_hash = models.BigIntegerField(_('value hash'), unique=True)
+    value = models.TextField(_('user agent'))
+
+    class Meta:
+        verbose_name = _('User Agent')
+        verbose_name_plural = _('User Agents')
+
+    def __str__(self):
+        return self.value
+
+    @staticmethod
+    def hash_value(value):
+        """Return a stable 63-bit hash of a user-agent string."""
+        digest = hashlib.blake2b(value.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, 'big') & 0x7FFF_FFFF_FFFF_FFFF
+
+
 class AuditLog(CoreBaseModel):
     """
     Model for tracking system-wide audit events.
@@ -178,17 +378,40 @@ class AuditLog(CoreBaseModel):
     object_id = models.CharField(_('object id'), max_length=100)
     details = models.JSONField(_('details'), default=dict, blank=True)
     ip_address = models.GenericIPAddressField(_('IP address'), null=True, blank=True)
-    user_agent = models.TextField(_('user agent'), blank=True)
+    user_agent = models.ForeignKey(
+        UserAgent,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        db_index=False,
+        related_name='+',
+        verbose_name=_('user agent')
+    )
     timestamp = models.DateTimeField(_('timestamp'), auto_now_add=True)
 
+    objects = AuditLogManager()
+
     class Meta:
         verbose_name = _('Audit Log')
         verbose_name_plural = _('Audit Logs')
         ordering = ['-timestamp']
         indexes = [
             models.Index(fields=['user', 'timestamp']),
-            models.Index(fields=['model_name', 'object_id']),
+            # object_id leads so lookups across models can use the index too
+            models.Index(fields=['object_id', 'model_name', 'timestamp'], name='core_auditlog_object_idx'),
             models.Index(fields=['action', 'timestamp']),
+            # Serves details__contains={...} lookups
+            GinIndex(fields=['details'], opclasses=['jsonb_path_ops'], name='core_auditlog_details_gin'),
+            # Rows are appended in timestamp order, so a BRIN index covers time-range
+            # scans over all rows (all_objects, retention purges) cheaply
+            BrinIndex(fields=['timestamp'], pages_per_range=32, name='core_auditlog_ts_brin'),
+            # BRIN cannot return rows in order; this serves the default manager's
+            # live-row listings ordered by -timestamp
+            models.Index(
+                fields=['timestamp'],
+                condition=models.Q(is_deleted=False),
+                name='core_auditlog_live_idx'
+            ),
         ]
 
     def __str__(self):
@@ -227,6 +450,17 @@ class SystemConfig(CoreBaseModel):
     def __str__(self):
         return f"{self.key} ({self.config_type})"
 
+    def delete(self, using=None, keep_parents=False):
+        # Soft delete updates the row directly, so no post_save fires
+        from .config import invalidate_config_cache_on_commit
+        super().delete(using=using, keep_parents=keep_parents)
+        invalidate_config_cache_on_commit(using=using)
+
+    def restore(self):
+        from .config import invalidate_config_cache_on_commit
+        super().restore()
+        invalidate_config_cache_on_commit(using=router.db_for_write(type(self), instance=self))
+
 
 class Notification(CoreBaseModel):
     """
@@ -272,6 +506,8 @@ class Notification(CoreBaseModel):
     related_object_id = models.CharField(_('related object ID'), max_length=100, blank=True)
     expires_at = models.DateTimeField(_('expires at'), null=True, blank=True)
 
+    objects = NotificationManager()
+
     class Meta:
         verbose_name = _('Notification')
         verbose_name_plural = _('Notifications')
@@ -279,6 +515,16 @@ class Notification(CoreBaseModel):
         indexes = [
             models.Index(fields=['user', 'is_read', 'created_at']),
             models.Index(fields=['expires_at', 'status']),
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(is_deleted=False),
+                name='core_notification_live_idx'
+            ),
+            models.Index(
+                fields=['related_model', 'related_object_id'],
+                condition=models.Q(is_deleted=False),
+                name='core_notification_live_rel_idx'
+            ),
         ]
 
     def __str__(self):
@@ -286,9 +532,17 @@ class Notification(CoreBaseModel):
 
     def mark_as_read(self):
         """Mark notification as read."""
+        now = timezone.now()
+        type(self)._base_manager.filter(pk=self.pk).update(is_read=True, read_at=now, updated_at=now)
         self.is_read = True
-        self.read_at = timezone.now()
-        self.save()
+        self.read_at = now
+        self.updated_at = now
+
+    @classmethod
+    def bulk_mark_read(cls, queryset):
+        """Mark all unread notifications in queryset as read in a single UPDATE."""
+        now = timezone.now()
+        return queryset.filter(is_read=False).update(is_read=True, read_at=now, updated_at=now)
 
 
 class FileAttachment(CoreBaseModel):
@@ -325,13 +579,24 @@ class FileAttachment(CoreBaseModel):
     related_model = models.CharField(_('related model'), max_length=100, blank=True)
     related_object_id = models.CharField(_('related object ID'), max_length=100, blank=True)
 
+    objects = FileAttachmentManager()
+
     class Meta:
         verbose_name = _('File Attachment')
         verbose_name_plural = _('File Attachments')
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['related_model', 'related_object_id']),
+            models.Index(
+                fields=['related_model', 'related_object_id'],
+                condition=models.Q(is_deleted=False),
+                name='core_fileattach_live_rel_idx'
+            ),
             models.Index(fields=['file_type', 'status']),
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(is_deleted=False),
+                name='core_fileattachment_live_idx'
+            ),
         ]
 
     def __str__(self):
@@ -340,14 +605,14 @@ class FileAttachment(CoreBaseModel):
     @property
     def file_size_human(self):
         """Return human-readable file size."""
-        if self.size < 1024:
+        # Each unit is 2**10 of the previous one, so the bit length picks the unit
+        unit = min(max(0, (self.size.bit_length() - 1) // 10), len(FILE_SIZE_UNITS) - 1)
+        if unit == 0:
             return f"{self.size} B"
-        elif self.size < 1024 * 1024:
-            return f"{self.size / 1024:.1f} KB"
-        elif self.size < 1024 * 1024 * 1024:
-            return f"{self.size / (1024 * 1024):.1f} MB"
-        else:
-            return f"{self.size / (1024 * 1024 * 1024):.1f} GB"
+        # Round halves up on the exact quotient, like ROUND() in with_human_size()
+        divisor = 1 << (10 * unit)
+        tenths = (self.size * 20 + divisor) // (2 * divisor)
+        return f"{tenths // 10}.{tenths % 10} {FILE_SIZE_UNITS[unit]}"
 
 
 class AcademicSession(CoreBaseModel):
@@ -391,6 +656,11 @@ class AcademicSession(CoreBaseModel):
             models.CheckConstraint(
                 check=models.Q(term_number__isnull=True) | models.Q(term_number__lte=models.F('number_of_semesters')),
                 name='term_number_within_semesters_range'
+            ),
+            models.UniqueConstraint(
+                fields=['is_current'],
+                condition=models.Q(is_current=True),
+                name='single_current_session'
             )
         ]
 
@@ -412,9 +682,17 @@ class AcademicSession(CoreBaseModel):
         Ensure only one session can be marked as current.
         """
         if self.is_current:
-            # Set all other sessions to not current
-            AcademicSession.objects.filter(is_current=True).update(is_current=False)
-        super().save(*args, **kwargs)
+            using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+            with transaction.atomic(using=using):
+                # Lock every session so concurrent promotions run one after the
+                # other; the single_current_session constraint rejects any that
+                # still slip through (e.g. two inserts into an empty table)
+                sessions = AcademicSession._base_manager.using(using)
+                list(sessions.select_for_update().values_list('pk', flat=True))
+                sessions.filter(is_current=True).exclude(pk=self.pk).update(is_current=False)
+                super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
 
     @property
     def semester_name(self):
@@ -474,11 +752,7 @@ class SequenceGenerator(CoreBaseModel):
     prefix = models.CharField(_('prefix'), max_length=10, blank=True)
     suffix = models.CharField(_('suffix'), max_length=10, blank=True)
     last_number = models.PositiveIntegerField(_('last number'), default=0)
-    padding = models.PositiveIntegerField(
-        _('number padding'),
-        default=6,
-        validators=[MinValueValidator(1), MaxValueValidator(10)]
-    )
+    padding = models.PositiveIntegerField(_('number padding'), default=6)
     reset_frequency = models.CharField(
         _('reset frequency'),
         max_length=20,
@@ -494,14 +768,26 @@ class SequenceGenerator(CoreBaseModel):
     class Meta:
         verbose_name = _('Sequence Generator')
         verbose_name_plural = _('Sequence Generators')
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(padding__gte=1) & models.Q(padding__lte=10),
+                name='sequence_padding_range'
+            )
+        ]
 
     def __str__(self):
         return f"{self.sequence_type} - Last: {self.last_number}"
 
     def get_next_number(self):
         """Generate and return the next sequential number."""
-        self.last_number += 1
-        self.save()
-        
+        with transaction.atomic():
+            # Increment in SQL so concurrent callers never hand out the same number
+            SequenceGenerator._base_manager.filter(pk=self.pk).update(
+                last_number=models.F('last_number') + 1,
+                updated_at=timezone.now()
+            )
+            # The UPDATE holds the row lock, so this reads our own increment
+            self.refresh_from_db(fields=['last_number'])
+
         number_str = str(self.last_number).zfill(self.padding)
         return f"{self.prefix}{number_str}{self.suffix}"
@@ -1,7 +1,20 @@
-from django.test import TestCase
+import time
+import uuid
+from datetime import date
+from unittest import mock
+
+from django.db import IntegrityError, connection, models, transaction
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import isolate_apps
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
-from .models import AuditLog, Notification, FileAttachment
+from . import audit, config
+from .config import VERSION_CACHE_KEY, get_config
+from .models import (
+    AddressModel, AuditLog, Notification, FileAttachment, AcademicSession, SequenceGenerator, SystemConfig,
+    UserAgent, uuid7
+)
 
 
 class CoreModelSmokeTests(TestCase):
@@ -45,3 +58,298 @@ class CoreModelSmokeTests(TestCase):
         )
         self.assertTrue(fa.pk)
         self.assertEqual(fa.file_size_human.split()[1], "B")
+
+    def test_status_change_tracked_without_extra_query(self):
+        note = Notification.objects.create(user=self.user, title="Status", message="status test")
+        note = Notification.objects.get(pk=note.pk)
+        original_changed_at = note.status_changed_at
+
+        # Saving a loaded instance should only issue the UPDATE
+        note.status = Notification.Status.ARCHIVED
+        with self.assertNumQueries(1):
+            note.save()
+        self.assertGreater(note.status_changed_at, original_changed_at)
+
+    def test_bulk_mark_read(self):
+        for i in range(3):
+            Notification.objects.create(user=self.user, title=f"Bulk {i}", message="bulk test")
+        with self.assertNumQueries(1):
+            updated = Notification.bulk_mark_read(Notification.objects.filter(user=self.user))
+        self.assertEqual(updated, 3)
+        self.assertFalse(Notification.objects.filter(user=self.user, read_at__isnull=True).exists())
+
+    def test_only_one_current_academic_session(self):
+        first = AcademicSession.objects.create(
+            name="2024/2025", start_date=date(2024, 9, 1), end_date=date(2025, 7, 31), is_current=True
+        )
+        second = AcademicSession.objects.create(
+            name="2025/2026", start_date=date(2025, 9, 1), end_date=date(2026, 7, 31), is_current=True
+        )
+        first.refresh_from_db()
+        self.assertFalse(first.is_current)
+
+        # Re-saving the current session must not demote it
+        second = AcademicSession.objects.get(pk=second.pk)
+        second.name = "2025/2026 Session"
+        second.save()
+        second.refresh_from_db()
+        self.assertTrue(second.is_current)
+
+        # Re-saving a stale copy of a formerly current session takes over again
+        stale = AcademicSession.objects.get(pk=second.pk)
+        AcademicSession.objects.create(
+            name="2026/2027", start_date=date(2026, 9, 1), end_date=date(2027, 7, 31), is_current=True
+        )
+        stale.save()
+        self.assertEqual(AcademicSession.objects.filter(is_current=True).get().pk, second.pk)
+
+        # Writes that bypass save() cannot leave two current sessions either
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            AcademicSession.objects.update(is_current=True)
+
+    def test_sequence_generator_increments_atomically(self):
+        sequence = SequenceGenerator.objects.create(
+            sequence_type=SequenceGenerator.SequenceType.INVOICE, prefix="INV-", padding=4
+        )
+        stale = SequenceGenerator.objects.get(pk=sequence.pk)
+        self.assertEqual(sequence.get_next_number(), "INV-0001")
+        # A stale in-memory copy must still get the next number, not a duplicate
+        self.assertEqual(stale.get_next_number(), "INV-0002")
+
+    def test_default_managers_join_user(self):
+        for i in range(3):
+            AuditLog.objects.create(
+                user=self.user, action=AuditLog.ActionType.VIEW, model_name="CoreModel", object_id=str(i)
+            )
+            Notification.objects.create(user=self.user, title=f"Join {i}", message="join test")
+        with self.assertNumQueries(2):
+            [str(log) for log in AuditLog.objects.all()]
+            [str(note) for note in Notification.objects.all()]
+        self.assertFalse(AuditLog.objects.without_user().query.select_related)
+
+    def test_file_attachment_reverse_relation(self):
+        attachment = FileAttachment.objects.create(
+            name="report.pdf", file="attachments/report.pdf", mime_type="application/pdf",
+            size=2048, uploaded_by=self.user
+        )
+        self.assertEqual(list(self.user.uploaded_files.all()), [attachment])
+        user = get_user_model().objects.prefetch_related("uploaded_files").get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual([str(fa.uploaded_by) for fa in user.uploaded_files.all()], [str(self.user)])
+
+    def test_bulk_notify(self):
+        User = get_user_model()
+        other = User.objects.create(email="core_test_other@example.com", password="testpass")
+        created = Notification.objects.bulk_notify(
+            [self.user, other.pk], title="Announcement", message="School closes early today"
+        )
+        self.assertEqual(created, 2)
+        self.assertEqual(Notification.objects.filter(title="Announcement").count(), 2)
+
+    def test_soft_delete_and_restore(self):
+        note = Notification.objects.create(user=self.user, title="Soft delete", message="soft delete test")
+        created_updated_at = note.updated_at
+        with self.assertNumQueries(1):
+            note.delete()
+        note.refresh_from_db()
+        self.assertTrue(note.is_deleted)
+        self.assertIsNotNone(note.deleted_at)
+        # Like save(), the targeted UPDATE bumps updated_at
+        self.assertGreater(note.updated_at, created_updated_at)
+        # The default manager only returns live rows
+        self.assertFalse(Notification.objects.filter(pk=note.pk).exists())
+        self.assertTrue(Notification.all_objects.filter(pk=note.pk).exists())
+
+        deleted_updated_at = note.updated_at
+        with self.assertNumQueries(1):
+            note.restore()
+        note.refresh_from_db()
+        self.assertFalse(note.is_deleted)
+        self.assertIsNone(note.deleted_at)
+        self.assertGreater(note.updated_at, deleted_updated_at)
+
+    def test_system_config_lookups_are_cached(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            config = SystemConfig.objects.create(key="ui.theme", value={"name": "light"})
+        self.assertEqual(get_config("ui.theme"), {"name": "light"})
+        with self.assertNumQueries(0):
+            self.assertEqual(get_config("ui.theme"), {"name": "light"})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            config.value = {"name": "dark"}
+            config.save()
+        self.assertEqual(get_config("ui.theme"), {"name": "dark"})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            config.delete()
+        self.assertEqual(get_config("ui.theme", default={}), {})
+
+    def test_system_config_invalidated_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            config = SystemConfig.objects.create(key="ui.density", value={"v": 1})
+        self.assertEqual(get_config("ui.density"), {"v": 1})
+        version = cache.get(VERSION_CACHE_KEY)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            config.value = {"v": 2}
+            config.save()
+            # Nothing is invalidated until the transaction commits
+            self.assertEqual(cache.get(VERSION_CACHE_KEY), version)
+            self.assertEqual(get_config("ui.density"), {"v": 1})
+
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(cache.get(VERSION_CACHE_KEY), version)
+        self.assertEqual(get_config("ui.density"), {"v": 2})
+
+    @isolate_apps("apps.core")
+    def test_full_address_expression_matches_property(self):
+        class Campus(AddressModel):
+            name = models.CharField(max_length=50)
+
+        with connection.schema_editor() as editor:
+            editor.create_model(Campus)
+        Campus.objects.create(name="full", address_line_1="1 Main St", city="Lagos", country="Nigeria")
+        Campus.objects.create(name="gaps", address_line_2="Block B", postal_code="100001")
+        Campus.objects.create(name="empty")
+
+        campuses = list(Campus.objects.annotate(full_address=Campus.full_address_expression()).order_by("name"))
+        for campus in campuses:
+            self.assertEqual(campus.full_address, Campus.objects.get(pk=campus.pk).full_address)
+        self.assertEqual(
+            [campus.full_address for campus in campuses], ["", "1 Main St, Lagos, Nigeria", "Block B, 100001"]
+        )
+
+        # Editing a field must not leave the annotated value behind
+        campus = campuses[1]
+        campus.city = "Abuja"
+        self.assertEqual(campus.full_address, "1 Main St, Abuja, Nigeria")
+
+    def test_config_version_checked_once_per_interval(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            SystemConfig.objects.create(key="ui.language", value="en")
+        now = time.monotonic() + 3600
+        with mock.patch.object(config, "cache", wraps=cache) as shared_cache, \
+                mock.patch.object(config, "time") as clock:
+            clock.monotonic.return_value = now
+            for _ in range(5):
+                self.assertEqual(get_config("ui.language"), "en")
+            self.assertEqual(shared_cache.get.call_count, 1)
+
+            clock.monotonic.return_value = now + config.VERSION_CHECK_INTERVAL
+            self.assertEqual(get_config("ui.language"), "en")
+            self.assertEqual(shared_cache.get.call_count, 2)
+
+    def test_for_list_defers_wide_columns(self):
+        AuditLog.objects.create(
+            user=self.user, action=AuditLog.ActionType.EXPORT, model_name="CoreModel", object_id="1",
+            details={"rows": 10}
+        )
+        with self.assertNumQueries(1):
+            logs = list(AuditLog.objects.for_list())
+            [str(log) for log in logs]
+        self.assertIn("details", logs[0].get_deferred_fields())
+
+    def test_with_human_size_matches_property(self):
+        # 1280, 2304 and 1310720 are exact .x5 ties
+        sizes = (0, 1023, 1024, 1280, 1536, 2304, 1310720, 5 * 1024 * 1024 + 300, 1536 * 1024 * 1024)
+        for size in sizes:
+            FileAttachment.objects.create(
+                name=f"file-{size}", file="attachments/test.bin", mime_type="application/octet-stream",
+                size=size, uploaded_by=self.user
+            )
+        for attachment in FileAttachment.objects.with_human_size():
+            self.assertEqual(attachment.size_human, attachment.file_size_human)
+        self.assertEqual(FileAttachment(size=1280).file_size_human, "1.3 KB")
+
+    def test_sequence_padding_checked_by_database(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            SequenceGenerator.objects.create(sequence_type=SequenceGenerator.SequenceType.RECEIPT, padding=11)
+
+
+class UUID7Tests(SimpleTestCase):
+    def test_layout(self):
+        before = time.time_ns() // 1_000_000
+        value = uuid7()
+        after = time.time_ns() // 1_000_000
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+        # The leading 48 bits are the Unix time in milliseconds
+        self.assertTrue(before <= value.int >> 80 <= after)
+
+    def test_time_ordered(self):
+        values = [uuid7() for _ in range(100)]
+        timestamps = [value.int >> 80 for value in values]
+        self.assertEqual(timestamps, sorted(timestamps))
+        time.sleep(0.002)
+        later = uuid7()
+        self.assertGreater(later.int >> 80, timestamps[-1])
+        self.assertGreater(later, values[-1])
+
+
+class AuditLogQueueTests(TestCase):
+    def setUp(self):
+        # Stop the background writer so entries are flushed on the test connection
+        audit.shutdown()
+        self.addCleanup(audit.start)
+        patcher = mock.patch.object(audit, "start")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(audit.flush)
+        # Ids cached by captured on-commit callbacks belong to rolled-back rows
+        self.addCleanup(audit._user_agent_ids.clear)
+
+    def log(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return audit.log_audit(action=AuditLog.ActionType.VIEW, model_name="CoreModel", **kwargs)
+
+    def test_log_audit_writes_on_flush(self):
+        entry = self.log(object_id="1", details={"note": "queued"})
+        self.assertFalse(AuditLog.objects.filter(pk=entry.pk).exists())
+        audit.flush()
+        self.assertEqual(AuditLog.objects.get(pk=entry.pk).details, {"note": "queued"})
+
+    def test_rolled_back_entries_are_not_queued(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                audit.log_audit(action=AuditLog.ActionType.VIEW, model_name="CoreModel", object_id="1")
+                raise RuntimeError
+        self.assertEqual(callbacks, [])
+
+    def test_bad_entry_does_not_drop_batch(self):
+        good = [self.log(object_id=str(i)) for i in range(3)]
+        bad = self.log(object_id="bad", user_agent_id=-1)
+        with self.assertLogs("apps.core.audit", "ERROR"):
+            audit.flush()
+        self.assertEqual(AuditLog.objects.filter(pk__in=[entry.pk for entry in good]).count(), 3)
+        self.assertFalse(AuditLog.objects.filter(pk=bad.pk).exists())
+
+    def test_shutdown_flushes_queue(self):
+        entries = [self.log(object_id=str(i)) for i in range(3)]
+        audit.shutdown()
+        self.assertEqual(AuditLog.objects.filter(pk__in=[entry.pk for entry in entries]).count(), 3)
+
+    def test_user_agent_hash_is_stable(self):
+        self.assertEqual(UserAgent.hash_value("Mozilla/5.0"), 1318407374697511714)
+
+    def test_intern_user_agent_reuses_committed_row(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            user_agent_id = audit.intern_user_agent("Mozilla/5.0")
+        with self.assertNumQueries(0):
+            self.assertEqual(audit.intern_user_agent("Mozilla/5.0"), user_agent_id)
+        self.assertEqual(UserAgent.objects.get(pk=user_agent_id).value, "Mozilla/5.0")
+
+    def test_intern_user_agent_not_cached_after_rollback(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                audit.intern_user_agent("curl/8.0")
+                raise RuntimeError
+        user_agent_id = audit.intern_user_agent("curl/8.0")
+        self.assertTrue(UserAgent.objects.filter(pk=user_agent_id).exists())
+
+    def test_log_audit_interns_user_agent_string(self):
+        entries = [self.log(object_id=str(i), user_agent="Mozilla/5.0") for i in range(2)]
+        audit.flush()
+        logs = AuditLog.objects.filter(pk__in=[entry.pk for entry in entries]).select_related("user_agent")
+        self.assertEqual([str(log.user_agent) for log in logs], ["Mozilla/5.0", "Mozilla/5.0"])
+        self.assertEqual(UserAgent.objects.filter(value="Mozilla/5.0").count(), 1)